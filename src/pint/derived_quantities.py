@@ -27,6 +27,19 @@ __all__ = [
     "shklovskii_factor",
 ]
 
+# Constant factors, evaluated once rather than on every call
+_FOUR_PI2 = 4.0 * np.pi ** 2
+# 4 pi^2 / (G Msun) in SI, for the mass function in solar masses
+_MASS_FUNCT_COEFF = _FOUR_PI2 / (const.G.value * const.M_sun.value)
+_G_OVER_C3_2_3 = (const.G / const.c ** 3) ** (2.0 / 3)
+_G_OVER_C3_5_3 = (const.G / const.c ** 3) ** (5.0 / 3)
+# Composite units, so the conversions below don't build them on every call
+_HZ_PER_S = u.Hz / u.s
+_G_CM2 = u.g * u.cm ** 2
+_ERG_PER_S = u.erg / u.s
+_RAD_PER_S = u.rad / u.s
+_PER_S = u.s ** -1
+
 
 @u.quantity_input(
     p=[u.Hz, u.s], pd=[u.Hz / u.s, u.s / u.s], pdd=[u.Hz / u.s ** 2, u.s / u.s ** 2]
@@ -60,15 +73,17 @@ def p_to_f(p, pd, pdd=None):
         if `pdd` is supplied, then frequency second derivative
         (or period second derivative), :math:`\ddot f` (or :math:`\ddot P`)
     """
+    # Each Quantity operation recomputes units, so share the powers of 1/p
     f = 1.0 / p
-    fd = -pd / (p * p)
+    f2 = f * f
+    fd = -pd * f2
     if pdd is None:
         return [f, fd]
     else:
         if pdd == 0.0:
             fdd = 0.0
         else:
-            fdd = 2.0 * pd * pd / (p ** 3.0) - pdd / (p * p)
+            fdd = (2.0 * pd * pd * f - pdd) * f2
         return [f, fd, fdd]
 
 
@@ -118,9 +133,8 @@ def pferrs(porf, porferr, pdorfd=None, pdorfderr=None):
         return [1.0 / porf, porferr / porf ** 2.0]
     else:
         forperr = porferr / porf ** 2.0
-        fdorpderr = np.sqrt(
-            (4.0 * pdorfd ** 2.0 * porferr ** 2.0) / porf ** 6.0
-            + pdorfderr ** 2.0 / porf ** 4.0
+        fdorpderr = np.hypot(
+            2.0 * pdorfd * porferr / porf ** 3.0, pdorfderr / porf ** 2.0
         )
         [forp, fdorpd] = p_to_f(porf, pdorfd)
         return [forp, forperr, fdorpd, fdorpderr]
@@ -166,7 +180,11 @@ def pulsar_age(f: u.Hz, fdot: u.Hz / u.s, n=3, fo=1e99 * u.Hz):
 
         \\tau = \\frac{f}{(n-1)\dot f}\\left(1-\\left(\\frac{f}{f_0}\\right)^{n-1}\\right)
     """
-    return (-f / ((n - 1.0) * fdot) * (1.0 - (f / fo) ** (n - 1.0))).to(u.yr)
+    # Work on bare values and convert the result once
+    f = f.to_value(u.Hz)
+    age = -f / ((n - 1.0) * fdot.to_value(_HZ_PER_S))
+    age *= 1.0 - (f / fo.to_value(u.Hz)) ** (n - 1.0)
+    return (age * u.s).to(u.yr)
 
 
 @u.quantity_input(I=u.g * u.cm ** 2)
@@ -202,7 +220,10 @@ def pulsar_edot(f: u.Hz, fdot: u.Hz / u.s, I=1.0e45 * u.g * u.cm ** 2):
     -----
     Calculates :math:`\dot E = -4\pi^2  I  f  \dot f`
     """
-    return (-4.0 * np.pi ** 2 * I * f * fdot).to(u.erg / u.s)
+    # g cm^2 Hz Hz/s is erg/s, so the bare values can be combined directly
+    return (
+        -_FOUR_PI2 * I.to_value(_G_CM2) * f.to_value(u.Hz) * fdot.to_value(_HZ_PER_S)
+    ) * _ERG_PER_S
 
 
 @u.quantity_input
@@ -237,7 +258,7 @@ def pulsar_B(f: u.Hz, fdot: u.Hz / u.s):
     """
     # This is a hack to use the traditional formula by stripping the units.
     # It would be nice to improve this to a  proper formula with units
-    return 3.2e19 * u.G * np.sqrt(-fdot.to_value(u.Hz / u.s) / f.to_value(u.Hz) ** 3.0)
+    return 3.2e19 * u.G * np.sqrt(-fdot.to_value(_HZ_PER_S) / f.to_value(u.Hz) ** 3.0)
 
 
 @u.quantity_input
@@ -271,15 +292,12 @@ def pulsar_B_lightcyl(f: u.Hz, fdot: u.Hz / u.s):
     -----
     Calculates :math:`B_{LC} = 2.9\\times 10^8\\,{\\rm G} P^{-5/2} \dot P^{1/2}`
     """
-    p, pd = p_to_f(f, fdot)
     # This is a hack to use the traditional formula by stripping the units.
     # It would be nice to improve this to a  proper formula with units
-    return (
-        2.9e8
-        * u.G
-        * p.to_value(u.s) ** (-5.0 / 2.0)
-        * np.sqrt(pd.to(u.dimensionless_unscaled).value)
-    )
+    f = f.to_value(u.Hz)
+    p = 1.0 / f
+    pd = -fdot.to_value(_HZ_PER_S) / (f * f)
+    return 2.9e8 * u.G * p ** (-5.0 / 2.0) * np.sqrt(pd)
 
 
 @u.quantity_input
@@ -319,8 +337,10 @@ def mass_funct(pb: u.d, x: u.cm):
 
     .. [1] Lorimer & Kramer, 2008, "The Handbook of Pulsar Astronomy", Eqn. 8.34 (RHS)
     """
-    fm = 4.0 * np.pi ** 2 * x ** 3 / (const.G * pb ** 2)
-    return fm.to(u.solMass)
+    # Work on bare SI values and convert the result once
+    x = x.to_value(u.m)
+    pb = pb.to_value(u.s)
+    return (_MASS_FUNCT_COEFF * x ** 3 / pb ** 2) * u.solMass
 
 
 @u.quantity_input
@@ -373,7 +393,12 @@ def pulsar_mass(pb: u.d, x: u.cm, mc: u.Msun, i: u.deg):
     """Compute pulsar mass from orbital parameters
 
     Return the pulsar mass (in solar mass units) for a binary.
-    Can handle scalar or array inputs.
+    Can handle scalar or array inputs; arrays are broadcast against
+    each other, so for example a grid of inclinations can be evaluated
+    in one call.
+    All arguments must be Quantities (an ``Angle`` for ``i`` is fine);
+    ``i`` may be in any angular unit, and a bare float or array of
+    inclinations raises a TypeError rather than being read as radians.
 
     Parameters
     ----------
@@ -435,13 +460,18 @@ def pulsar_mass(pb: u.d, x: u.cm, mc: u.Msun, i: u.deg):
     return ((-cb + np.sqrt(4 * massfunct * mc ** 3 * sini ** 3)) / (2 * ca)).to(u.Msun)
 
 
-@u.quantity_input(inc=u.deg, mpsr=u.solMass)
+@u.quantity_input(i=u.deg, mp=u.solMass)
 def companion_mass(pb: u.d, x: u.cm, i=60.0 * u.deg, mp=1.4 * u.solMass):
     """Commpute the companion mass from the orbital parameters
 
     Compute companion mass for a binary system from orbital mechanics,
     not Shapiro delay.
-    Can handle scalar or array inputs.
+    Can handle scalar or array inputs; arrays are broadcast against
+    each other, so for example a grid of inclinations can be evaluated
+    in one call.
+    All arguments must be Quantities (an ``Angle`` for ``i`` is fine);
+    ``i`` may be in any angular unit and ``mp`` in any mass unit, and bare
+    floats or arrays for either raise a TypeError.
 
     Parameters
     ----------
@@ -471,7 +501,7 @@ def companion_mass(pb: u.d, x: u.cm, i=60.0 * u.deg, mp=1.4 * u.solMass):
     >>> import pint
     >>> import pint.derived_quantities
     >>> from astropy import units as u
-    >>> print(pint.derived_quantities.companion_mass(1*u.d, 2*pint.ls, inc=30*u.deg, mpsr=1.3*u.Msun))
+    >>> print(pint.derived_quantities.companion_mass(1*u.d, 2*pint.ls, i=30*u.deg, mp=1.3*u.Msun))
     0.6363138973397279 solMass
 
     Notes
@@ -529,7 +559,7 @@ def companion_mass(pb: u.d, x: u.cm, i=60.0 * u.deg, mp=1.4 * u.solMass):
     # pick the - branch since delta1 is <0 so that delta1 - Q is never near 0
     Ccubed = 0.5 * (delta1 + Q)
     # try to get the real root
-    C = np.sign(Ccubed) * np.fabs(Ccubed) ** (1.0 / 3)
+    C = np.cbrt(Ccubed)
     # note that the difference b**2 - 3*a*c should be strictly positive
     # so those shouldn't cancel
     # and then all three terms should have the same signs
@@ -592,12 +622,12 @@ def pbdot(mp: u.Msun, mc: u.Msun, pb: u.d, e: u.dimensionless_unscaled):
     """
     f = (1 + (73.0 / 24) * e ** 2 + (37.0 / 96) * e ** 4) / (1 - e ** 2) ** (7.0 / 2)
     value = (
-        (const.G / const.c ** 3) ** (5.0 / 3)
+        _G_OVER_C3_5_3
         * (pb / (2 * np.pi)) ** (-5.0 / 3)
         * (-192 * np.pi / 5)
         * f
         * (mp * mc)
-        / (mp + mc) ** (1.0 / 3)
+        / np.cbrt(mp + mc)
     )
     return value.to(u.s / u.s)
 
@@ -649,8 +679,8 @@ def gamma(mp: u.Msun, mc: u.Msun, pb: u.d, e: u.dimensionless_unscaled):
 
     """
     value = (
-        (const.G / const.c ** 3) ** (2.0 / 3)
-        * (pb / (2 * np.pi)) ** (1.0 / 3)
+        _G_OVER_C3_2_3
+        * np.cbrt(pb / (2 * np.pi))
         * e
         * (mc * (mp + 2 * mc))
         / (mp + mc) ** (4.0 / 3)
@@ -765,7 +795,7 @@ def omdot_to_mtot(omdot: u.deg / u.yr, pb: u.d, e: u.dimensionless_unscaled):
                 omdot
                 / (
                     3
-                    * (const.G / const.c ** 3) ** (2.0 / 3)
+                    * _G_OVER_C3_2_3
                     * (pb / (2 * np.pi)) ** (-5.0 / 3)
                     * (1 - e ** 2) ** (-1)
                 )
@@ -822,8 +852,7 @@ def a1sini(mp, mc, pb, i=90 * u.deg):
 
     """
     return (
-        (mc * np.sin(i))
-        * (const.G * (pb / (2 * np.pi)) ** 2 / (mp + mc) ** 2) ** (1.0 / 3)
+        (mc * np.sin(i)) * np.cbrt(const.G * (pb / (2 * np.pi)) ** 2 / (mp + mc) ** 2)
     ).to(pint.ls)
 
 
@@ -858,8 +887,7 @@ def shklovskii_factor(pmtot: u.mas / u.yr, D: u.kpc):
     -----
     .. [10] Lorimer & Kramer, 2008, "The Handbook of Pulsar Astronomy", Eqn. 8.12        
     """
-    # This uses the small angle approximation that sin(x) = x, so we need to
-    # make our angle dimensionless.
-    with u.set_enabled_equivalencies(u.dimensionless_angles()):
-        a_s = (D * pmtot ** 2 / const.c).to(u.s ** -1)
-    return a_s
+    # This uses the small angle approximation that sin(x) = x, so the
+    # proper motion is taken in rad/s and the angle dropped.
+    pmtot = pmtot.to_value(_RAD_PER_S)
+    return (D.to_value(u.m) * pmtot ** 2 / const.c.value) * _PER_S
@@ -1,6 +1,5 @@
 """Functions related to simulating TOAs and models
 """
-from collections import OrderedDict
 from copy import deepcopy
 
 import astropy.units as u
@@ -381,7 +380,13 @@ def make_fake_toas_fromtim(timfile, model, add_noise=False, name="fake"):
 
 
 def calculate_random_models(
-    fitter, toas, Nmodels=100, keep_models=True, return_time=False, params="all"
+    fitter,
+    toas,
+    Nmodels=100,
+    keep_models=True,
+    return_time=False,
+    params="all",
+    linear=False,
 ):
     """
     Calculates random models based on the covariance matrix of the `fitter` object.
@@ -401,6 +406,12 @@ def calculate_random_models(
         whether to keep and return the individual random models (slower)
     params: list, optional
         if specified, selects only those parameters to vary.  Default ('all') is to use all parameters other than Offset
+    linear: bool, optional
+        if True, compute the phase differences from the derivatives of the phase
+        with respect to the parameters, in a single matrix product, rather than
+        evaluating the phase of every random model.  This is much faster but only
+        accurate when the phase is close to linear in the varied parameters over
+        their uncertainties; this may not be the case for binary parameters, for example.
 
     Returns
     -------
@@ -438,69 +449,111 @@ def calculate_random_models(
 
     or similar
     """
-    Nmjd = len(toas)
-    phases_i = np.zeros((Nmodels, Nmjd))
-    phases_f = np.zeros((Nmodels, Nmjd))
-    freqs = np.zeros((Nmodels, Nmjd), dtype=np.float128) * u.Hz
-
     cov_matrix = fitter.parameter_covariance_matrix
     # this is a list of the parameter names in the order they appear in the coviarance matrix
-    param_names = cov_matrix.get_label_names(axis=0)
-    # this is a dictionary with the parameter values, but it might not be in the same order
-    # and it leaves out the Offset parameter
-    param_values = fitter.model.get_params_dict("free", "value")
-    mean_vector = np.array([param_values[x] for x in param_names if not x == "Offset"])
+    all_names = cov_matrix.get_label_names(axis=0)
     if params == "all":
-        # remove the first column and row (absolute phase)
-        if param_names[0] == "Offset":
-            cov_matrix = cov_matrix.get_label_matrix(param_names[1:])
-            fac = fitter.fac[1:]
-            param_names = param_names[1:]
-        else:
-            fac = fitter.fac
+        # leave out the absolute phase
+        param_names = [p for p in all_names if p != "Offset"]
     else:
         # only select some parameters
-        # need to also select from the fac array and the mean_vector array
-        idx, labels = cov_matrix.get_label_slice(params)
-        cov_matrix = cov_matrix.get_label_matrix(params)
-        index = idx[0].flatten()
-        fac = fitter.fac[index]
-        # except mean_vector does not have the 'Offset' entry
-        # so may need to subtract 1
-        if param_names[0] == "Offset":
-            mean_vector = mean_vector[index - 1]
-        else:
-            mean_vector = mean_vector[index]
-        param_names = cov_matrix.get_label_names(axis=0)
+        param_names = list(params)
+    # pick the rows and columns of the selected parameters straight out of
+    # the covariance matrix, and the matching entries of fac
+    position = {p: i for i, p in enumerate(all_names)}
+    index = np.array([position[p] for p in param_names])
+    fac = fitter.fac[index]
+    # longdouble so that parameters like F0 keep their full precision
+    mean_vector = np.fromiter(
+        (getattr(fitter.model, p).value for p in param_names),
+        dtype=np.longdouble,
+        count=len(param_names),
+    )
 
-    f_rand = deepcopy(fitter)
+    # only the model changes from draw to draw, so there is no need to
+    # copy the whole fitter (with its TOAs and residuals)
+    m_rand = deepcopy(fitter.model)
 
     # scale by fac
     mean_vector = mean_vector * fac
-    scaled_cov_matrix = ((cov_matrix.matrix * fac).T * fac).T
+    scaled_cov_matrix = cov_matrix.matrix[np.ix_(index, index)] * np.outer(fac, fac)
+    # create all the sets of randomized parameters based on mean vector and
+    # covariance matrix at once, so the covariance is only factored once;
+    # a Cholesky factor is cheapest, but needs the matrix to be positive
+    # definite, otherwise let multivariate_normal use its SVD
+    try:
+        L = np.linalg.cholesky(scaled_cov_matrix)
+    except np.linalg.LinAlgError:
+        rparams_all = np.random.multivariate_normal(
+            mean_vector, scaled_cov_matrix, size=Nmodels
+        )
+    else:
+        z = np.random.standard_normal((Nmodels, len(mean_vector)))
+        rparams_all = mean_vector + z @ L.T
+    # scale params back to real units
+    rparams_all /= fac
+    # one dict of parameter values, refilled for each model
+    rparams = dict.fromkeys(param_names)
     random_models = []
-    for imodel in range(Nmodels):
-        # create a set of randomized parameters based on mean vector and covariance matrix
-        rparams_num = np.random.multivariate_normal(mean_vector, scaled_cov_matrix)
-        # scale params back to real units
-        for j in range(len(mean_vector)):
-            rparams_num[j] /= fac[j]
-        rparams = OrderedDict(zip(param_names, rparams_num))
-        f_rand.set_params(rparams)
-        phase = f_rand.model.phase(toas, abs_phase=True)
-        phases_i[imodel] = phase.int
-        phases_f[imodel] = phase.frac
-        r = pint.residuals.Residuals(toas, f_rand.model)
-        freqs[imodel] = r.get_PSR_freq(calctype="taylor")
+    if linear:
+        # each model's phase differs from the input model's by the phase
+        # derivatives times its parameter offsets, so all the models need
+        # only one matrix product
+        model = fitter.model
+        if "AbsPhase" not in model.components:
+            # let phase() set up the TZR TOA as it would for the full calculation
+            model.phase(toas, abs_phase=True)
+        tz_toa = model.get_TZR_toa(toas)
+        delay = model.delay(toas)
+        tz_delay = model.delay(tz_toa)
+        # the absolute phase is measured from the TZR TOA; the derivatives come
+        # back as longdouble but float64 is plenty, and lets BLAS do the product
+        dphase_dparams = np.array(
+            [
+                (
+                    model.d_phase_d_param(toas, delay, param)
+                    - model.d_phase_d_param(tz_toa, tz_delay, param)
+                ).to_value(u.Unit("") / getattr(model, param).units)
+                for param in param_names
+            ],
+            dtype=float,
+        )
+        dparams = np.asarray(rparams_all - mean_vector / fac, dtype=float)
+        dphase = dparams @ dphase_dparams
+        if return_time:
+            r = pint.residuals.Residuals(toas, model)
+            freqs = r.get_PSR_freq(calctype="taylor")
         if keep_models:
-            random_models.append(f_rand.model)
-            f_rand = deepcopy(fitter)
-    phases = phases_i + phases_f
-    phases0 = fitter.model.phase(toas, abs_phase=True)
-    dphase = phases - (phases0.int + phases0.frac)
+            for rparams_num in rparams_all:
+                rparams.update(zip(param_names, rparams_num))
+                m_rand.set_param_values(rparams)
+                random_models.append(deepcopy(m_rand))
+    else:
+        Nmjd = len(toas)
+        dphase = np.empty((Nmodels, Nmjd))
+        if return_time:
+            freqs = np.zeros((Nmodels, Nmjd), dtype=np.float128) * u.Hz
+        # the phases are absolute, i.e. measured from the TZR TOA; that
+        # reference phase depends on the varied parameters too, so it does
+        # not cancel in the differences
+        phases0 = fitter.model.phase(toas, abs_phase=True)
+        for imodel in range(Nmodels):
+            rparams.update(zip(param_names, rparams_all[imodel]))
+            # every varied parameter is overwritten, so the same copy can be reused
+            m_rand.set_param_values(rparams)
+            phase = m_rand.phase(toas, abs_phase=True)
+            # difference the integer parts first so no precision is lost
+            dphase[imodel] = (phase.int - phases0.int) + (phase.frac - phases0.frac)
+            if return_time:
+                # building the residuals evaluates the phase again, so only
+                # do it when the frequencies are needed
+                r = pint.residuals.Residuals(toas, m_rand)
+                freqs[imodel] = r.get_PSR_freq(calctype="taylor")
+            if keep_models:
+                random_models.append(deepcopy(m_rand))
 
     if return_time:
-        dphase /= freqs
+        dphase = dphase / freqs
 
     if keep_models:
         return dphase, random_models
@@ -35,22 +35,19 @@ import logging
 import os
 import platform
 import re
+import sys
 import textwrap
 from collections import OrderedDict
 from contextlib import contextmanager
-from copy import deepcopy
+from functools import lru_cache
 from io import StringIO
+from warnings import warn
 
 import astropy.constants as const
-import astropy.coordinates as coords
-import astropy.coordinates.angles as angles
 import astropy.units as u
 import numpy as np
-import scipy.optimize.zeros as zeros
-from scipy.special import fdtrc
 
 import pint
-import pint.pulsar_ecliptic
 
 log = logging.getLogger(__name__)
 
@@ -76,6 +73,7 @@ __all__ = [
     "weighted_mean",
     "ELL1_check",
     "FTest",
+    "FTest_batch",
     "add_dummy_distance",
     "remove_dummy_distance",
     "info_string",
@@ -94,6 +92,12 @@ class PosVel:
     units).  The 'pos' and 'vel' params are 3-vectors of the positions
     and velocities respectively.
 
+    'pos' and 'vel' are read-only properties: each access builds a new
+    array or Quantity from the values stored internally, and assigning
+    to them raises an AttributeError.  Modifying the returned object in
+    place is not guaranteed to change the PosVel; construct a new PosVel
+    instead.
+
     The coordinates are generally assumed to be aligned with ICRF (J2000),
     i.e. they are in an intertial, not earth-rotating frame
 
@@ -110,54 +114,90 @@ class PosVel:
     """
 
     def __init__(self, pos, vel, obj=None, origin=None):
-        if len(pos) != 3:
-            raise ValueError("Position vector has length %d instead of 3" % len(pos))
-        if isinstance(pos, u.Quantity):
-            self.pos = pos
-        else:
-            self.pos = np.asarray(pos)
-
-        if len(vel) != 3:
-            raise ValueError("Position vector has length %d instead of 3" % len(pos))
-        if isinstance(vel, u.Quantity):
-            self.vel = vel
-        else:
-            self.vel = np.asarray(vel)
+        if not isinstance(pos, u.Quantity):
+            pos = np.asarray(pos)
+        if not isinstance(vel, u.Quantity):
+            vel = np.asarray(vel)
+        for name, a in (("Position", pos), ("Velocity", vel)):
+            if a.shape[:1] != (3,):
+                raise ValueError(
+                    "{} vector has shape {} instead of (3, ...)".format(name, a.shape)
+                )
 
-        if len(self.pos.shape) != len(self.vel.shape):
+        if len(pos.shape) != len(vel.shape):
             # FIXME: could broadcast them, but have to be careful
             raise ValueError(
                 "pos and vel must have the same number of dimensions but are {} and {}".format(
-                    self.pos.shape, self.vel.shape
+                    pos.shape, vel.shape
                 )
             )
-        elif self.pos.shape != self.vel.shape:
-            self.pos, self.vel = np.broadcast_arrays(self.pos, self.vel, subok=True)
 
         if bool(obj is None) != bool(origin is None):
             raise ValueError(
                 "If one of obj and origin is specified, the other must be too."
             )
-        self.obj = obj
-        self.origin = origin
+        # Labels are interned so that chained additions can usually compare
+        # them by identity
+        self.obj = sys.intern(obj) if isinstance(obj, str) else obj
+        self.origin = sys.intern(origin) if isinstance(origin, str) else origin
+        self._labeled = obj is not None
+
+        # pos and vel are stored together as rows [:3] and [3:] of one array
+        # of bare values so that arithmetic on a PosVel is a single numpy
+        # operation; their units are kept separately.
+        self._pos_unit = pos.unit if isinstance(pos, u.Quantity) else None
+        self._vel_unit = vel.unit if isinstance(vel, u.Quantity) else None
+        pos = pos.value if self._pos_unit is not None else pos
+        vel = vel.value if self._vel_unit is not None else vel
+        shape = np.broadcast(pos, vel).shape
         # FIXME: what about dtype compatibility?
+        self._data = np.empty((6,) + shape[1:], dtype=np.result_type(pos, vel))
+        self._data[:3] = pos
+        self._data[3:] = vel
+
+    @classmethod
+    def _from_data(cls, data, pos_unit, vel_unit, obj, origin):
+        """Wrap an existing (6, ...) array without copying or checking it."""
+        r = cls.__new__(cls)
+        r._data = data
+        r._pos_unit = pos_unit
+        r._vel_unit = vel_unit
+        r.obj = obj
+        r.origin = origin
+        r._labeled = obj is not None
+        return r
+
+    @property
+    def pos(self):
+        if self._pos_unit is None:
+            return self._data[:3]
+        return u.Quantity(self._data[:3], self._pos_unit, copy=False)
+
+    @property
+    def vel(self):
+        if self._vel_unit is None:
+            return self._data[3:]
+        return u.Quantity(self._data[3:], self._vel_unit, copy=False)
 
     def _has_labels(self):
-        return (self.obj is not None) and (self.origin is not None)
+        return self._labeled
 
     def __neg__(self):
-        return PosVel(-self.pos, -self.vel, obj=self.origin, origin=self.obj)
+        return self._from_data(
+            -self._data, self._pos_unit, self._vel_unit, self.origin, self.obj
+        )
 
     def __add__(self, other):
         obj = None
         origin = None
-        if self._has_labels() and other._has_labels():
+        if self._labeled and other._labeled:
             # here we check that the addition "makes sense", ie the endpoint
             # of self is the origin of other (or vice-versa)
-            if self.obj == other.origin:
+            # The identity checks catch the common case of interned labels
+            if self.obj is other.origin or self.obj == other.origin:
                 origin = self.origin
                 obj = other.obj
-            elif self.origin == other.obj:
+            elif self.origin is other.obj or self.origin == other.obj:
                 origin = other.origin
                 obj = self.obj
             else:
@@ -167,9 +207,25 @@ class PosVel:
                     % (self.origin, self.obj, other.origin, other.obj)
                 )
 
-        return PosVel(
-            self.pos + other.pos, self.vel + other.vel, obj=obj, origin=origin
-        )
+        if self._pos_unit == other._pos_unit and self._vel_unit == other._vel_unit:
+            data = self._data + other._data
+        elif None not in (
+            self._pos_unit,
+            self._vel_unit,
+            other._pos_unit,
+            other._vel_unit,
+        ):
+            # Convert other to our units, as Quantity addition would
+            scale = np.empty((6,) + (1,) * (other._data.ndim - 1))
+            scale[:3] = other._pos_unit.to(self._pos_unit)
+            scale[3:] = other._vel_unit.to(self._vel_unit)
+            data = self._data + other._data * scale
+        else:
+            # Mixing bare arrays and Quantities; let astropy sort it out
+            return PosVel(
+                self.pos + other.pos, self.vel + other.vel, obj=obj, origin=origin
+            )
+        return self._from_data(data, self._pos_unit, self._vel_unit, obj, origin)
 
     def __sub__(self, other):
         return self.__add__(other.__neg__())
@@ -197,8 +253,8 @@ class PosVel:
             ix = (colon,) + k
         else:
             ix = (colon, k)
-        return self.__class__(
-            self.pos[ix], self.vel[ix], obj=self.obj, origin=self.origin
+        return self._from_data(
+            self._data[ix], self._pos_unit, self._vel_unit, self.obj, self.origin
         )
 
 
@@ -220,38 +276,63 @@ def numeric_partial(f, args, ix=0, delta=1e-6):
     return (r2 - r3) / delta
 
 
-def numeric_partials(f, args, delta=1e-6):
+def numeric_partials(f, args, delta=1e-6, vectorized=False):
     """Compute all the partial derivatives of f numerically.
 
     Returns a matrix of the partial derivative of every return value
     with respect to every input argument. f is assumed to take a flat list
     of numeric arguments and return a list or array of values.
-    """
-    r = [numeric_partial(f, args, i, delta) for i in range(len(args))]
-    return np.array(r).T
 
-
-def check_all_partials(f, args, delta=1e-6, atol=1e-4, rtol=1e-4):
+    If ``vectorized`` is True, f must broadcast over its arguments: it is
+    then called only once, with each argument replaced by an array of the
+    2N perturbed values (N being the number of arguments), and it must
+    return values whose last axis runs over these 2N evaluations.
+    """
+    if not vectorized:
+        r = [numeric_partial(f, args, i, delta) for i in range(len(args))]
+        return np.array(r).T
+    n = len(args)
+    X = np.tile(np.asarray(args, dtype=float), (2 * n, 1))
+    X[np.arange(n), np.arange(n)] += delta / 2.0
+    X[np.arange(n, 2 * n), np.arange(n)] -= delta / 2.0
+    R = np.array(f(*X.T))
+    d = (R[..., :n] - R[..., n:]) / delta
+    # Match the axis order produced by the loop above
+    return np.moveaxis(d, -1, 0).T
+
+
+def check_all_partials(f, args, delta=1e-6, atol=1e-4, rtol=1e-4, vectorized=False):
     """Check the partial derivatives of a function that returns derivatives.
 
     The function is assumed to return a pair (values, partials), where
     partials is supposed to be a matrix of the partial derivatives of f
     with respect to all its arguments. These values are checked against
-    numerical partial derivatives.
+    numerical partial derivatives. If f broadcasts over its arguments,
+    pass ``vectorized=True`` to evaluate all the numerical partials in a
+    single call (see :func:`numeric_partials`).
     """
     _, jac = f(*args)
     jac = np.asarray(jac)
-    njac = numeric_partials(lambda *args: f(*args)[0], args, delta)
+    njac = numeric_partials(
+        lambda *args: f(*args)[0], args, delta, vectorized=vectorized
+    )
 
     try:
         np.testing.assert_allclose(jac, njac, atol=atol, rtol=rtol)
     except AssertionError:
         # print jac
         # print njac
-        d = np.abs(jac - njac) / (atol + rtol * np.abs(njac))
-        print("fail fraction:", np.sum(d > 1) / float(np.sum(d >= 0)))
-        worst_ix = np.unravel_index(np.argmax(d.reshape((-1,))), d.shape)
-        print("max fail:", np.amax(d), "at", worst_ix)
+        # Work in place; the jacobians can be large
+        d = np.subtract(jac, njac, dtype=np.result_type(jac, njac, float))
+        np.abs(d, out=d)
+        scale = np.abs(njac, dtype=d.dtype)
+        scale *= rtol
+        scale += atol
+        d /= scale
+        print("fail fraction:", np.count_nonzero(d > 1) / np.count_nonzero(d >= 0))
+        worst = np.argmax(d)
+        worst_ix = np.unravel_index(worst, d.shape)
+        print("max fail:", d.flat[worst], "at", worst_ix)
         print("jac there:", jac[worst_ix], "njac there:", njac[worst_ix])
         raise
 
@@ -273,12 +354,17 @@ prefix_pattern = [
     re.compile(r"^([a-zA-Z0-9]+_)(\d+)$"),  # For the prefix like DMXR1_3
     # re.compile(r'([a-zA-Z]\d[a-zA-Z]+)(\d+)'),  # for prefixes like PLANET_SHAPIRO2?
 ]
+# All of the above as alternatives of a single regex, tried in the same order
+_prefix_pattern_combined = re.compile(
+    "|".join("(?:{})".format(pt.pattern) for pt in prefix_pattern)
+)
 
 
 class PrefixError(ValueError):
     pass
 
 
+@lru_cache(maxsize=4096)
 def split_prefixed_name(name):
     """Split a prefixed name.
 
@@ -315,17 +401,31 @@ def split_prefixed_name(name):
         pint.utils.PrefixError: Unrecognized prefix name pattern 'PEPOCH'.
 
     """
-    for pt in prefix_pattern:
-        try:
-            prefix_part, index_part = pt.match(name).groups()
-            break
-        except AttributeError:
-            continue
-    else:
+    m = _prefix_pattern_combined.match(name)
+    if m is None:
         raise PrefixError("Unrecognized prefix name pattern '%s'." % name)
+    # Each alternative has two groups, and the last one matched is the index
+    prefix_part, index_part = m.group(m.lastindex - 1, m.lastindex)
     return prefix_part, index_part, int(index_part)
 
 
+def _coeff_to_value(coeff, unit):
+    """Return a Taylor coefficient as a bare value in ``unit``.
+
+    Bare coefficients are taken as dimensionless, except that, as in
+    astropy arithmetic, zeros (and infinities and NaNs) are accepted
+    whatever ``unit`` is.
+    """
+    try:
+        return u.Quantity(coeff, copy=False).to_value(unit)
+    except u.UnitConversionError:
+        if not hasattr(coeff, "unit") and np.all(
+            np.equal(coeff, 0.0) | ~np.isfinite(coeff)
+        ):
+            return coeff
+        raise
+
+
 def taylor_horner(x, coeffs):
     """Evaluate a Taylor series of coefficients at x via the Horner scheme.
 
@@ -381,15 +481,34 @@ def taylor_horner_deriv(x, coeffs, deriv_order=1):
         Output value; same shape as input. Units as inferred from inputs.
     """
     result = 0.0
+    der_coeffs = coeffs[deriv_order::]
+    fact = len(der_coeffs)
     if hasattr(coeffs[-1], "unit"):
         if not hasattr(x, "unit"):
             x = x * u.Unit("")
-        result *= coeffs[-1].unit / x.unit
-    der_coeffs = coeffs[deriv_order::]
-    fact = len(der_coeffs)
-    for coeff in der_coeffs[::-1]:
-        result = result * x / fact + coeff
+        # Run the loop on bare values and attach the unit once at the end,
+        # converting each coefficient to the unit it has when it enters the sum
+        result_unit = coeffs[-1].unit * x.unit ** (fact - 1)
+        der_coeffs = [
+            _coeff_to_value(coeff, result_unit / x.unit ** i)
+            for i, coeff in enumerate(der_coeffs)
+        ]
+        x = x.value
+    else:
+        result_unit = None
+    if fact > 0:
+        # The first step of the scheme would just multiply zeros by x, so
+        # start from the leading coefficient instead
+        result = der_coeffs[-1]
         fact -= 1.0
+        for coeff in der_coeffs[-2::-1]:
+            result = result * x / fact + coeff
+            fact -= 1.0
+        if len(der_coeffs) == 1:
+            # Still give an output the shape of x
+            result = result + 0.0 * x
+    if result_unit is not None:
+        result = result * result_unit
     return result
 
 
@@ -403,7 +522,8 @@ def open_or_use(f, mode="r"):
 
     """
     if isinstance(f, (str, bytes)):
-        with open(f, mode) as fl:
+        # A large buffer cuts the number of reads for big par and tim files
+        with open(f, mode, buffering=2 ** 20 if mode == "r" else -1) as fl:
             yield fl
     else:
         yield f
@@ -419,8 +539,20 @@ def lines_of(f):
 
     """
     with open_or_use(f) as fo:
-        for l in fo:
-            yield l
+        yield from fo
+
+
+@lru_cache()
+def _comment_prefixes(cc):
+    """Check a tuple of comment strings once for use with str.startswith."""
+    for c in cc:
+        cs = c.strip()
+        if not cs or not c.startswith(cs):
+            raise ValueError(
+                "Unable to deal with comments that start with whitespace, "
+                "but comment string {!r} was requested.".format(c)
+            )
+    return cc
 
 
 def interesting_lines(lines, comments=None):
@@ -437,26 +569,14 @@ def interesting_lines(lines, comments=None):
         cc = (comments,)
     else:
         cc = tuple(comments)
-    for c in cc:
-        cs = c.strip()
-        if not cs or not c.startswith(cs):
-            raise ValueError(
-                "Unable to deal with comments that start with whitespace, "
-                "but comment string {!r} was requested.".format(c)
-            )
-    for ln in lines:
-        ln = ln.strip()
-        if not ln:
-            continue
-        if ln.startswith(cc):
-            continue
-        yield ln
+    cc = _comment_prefixes(cc)
+    yield from (ln for ln in (l.strip() for l in lines) if ln and not ln.startswith(cc))
 
 
 def show_param_cov_matrix(matrix, params, name="Covariance Matrix", switchRD=False):
     """function to print covariance matrices in a clean and easily readable way
 
-    :param matrix: matrix to be printed, should be square, list of lists
+    :param matrix: matrix to be printed, should be square, list of lists or array
     :param params: name of the parameters in the matrix, list
     :param name: title to be printed above, default Covariance Matrix
     :param switchRD: if True, switch the positions of RA and DEC to match setup of TEMPO cov. matrices
@@ -474,7 +594,7 @@ def show_param_cov_matrix(matrix, params, name="Covariance Matrix", switchRD=Fal
     )
 
     output = StringIO()
-    matrix = deepcopy(matrix)
+    matrix = np.array(matrix, dtype=float, copy=True)
     try:
         RAi = params.index("RAJ")
     except:
@@ -495,13 +615,8 @@ def show_param_cov_matrix(matrix, params, name="Covariance Matrix", switchRD=Fal
     if switchRD:
         # switch RA and DEC so cov matrix matches TEMPO
         params1[RAi : RAi + 2] = [params1[RAi + 1], params1[RAi]]
-        i = 0
-        while i < 2:
-            RA = deepcopy(matrix[RAi])
-            matrix[RAi] = matrix[RAi + 1]
-            matrix[RAi + 1] = RA
-            matrix = matrix.T
-            i += 1
+        matrix[[RAi, RAi + 1]] = matrix[[RAi + 1, RAi]]
+        matrix[:, [RAi, RAi + 1]] = matrix[:, [RAi + 1, RAi]]
     output.write(name + " switch RD = " + str(switchRD) + "\n")
     output.write(" ")
     for param in params1:
@@ -549,27 +664,76 @@ def pmtot(model):
         If no Astrometry component is found in the model
     """
 
-    if "AstrometryEcliptic" in model.components.keys():
-        return np.sqrt(model.PMELONG.quantity ** 2 + model.PMELAT.quantity ** 2).to(
-            u.mas / u.yr
-        )
-    elif "AstrometryEquatorial" in model.components.keys():
-        return np.sqrt(model.PMRA.quantity ** 2 + model.PMDEC.quantity ** 2).to(
-            u.mas / u.yr
-        )
+    # model.components builds a new dict each time it is accessed
+    comps = model.components
+    if "AstrometryEcliptic" in comps:
+        return np.hypot(
+            model.PMELONG.quantity.to_value(u.mas / u.yr),
+            model.PMELAT.quantity.to_value(u.mas / u.yr),
+        ) * (u.mas / u.yr)
+    elif "AstrometryEquatorial" in comps:
+        return np.hypot(
+            model.PMRA.quantity.to_value(u.mas / u.yr),
+            model.PMDEC.quantity.to_value(u.mas / u.yr),
+        ) * (u.mas / u.yr)
     else:
         raise AttributeError("No Astrometry component found")
 
 
+def _in_any_interval(x, lows, highs, closed=False):
+    """Find which values fall inside any of a set of intervals.
+
+    The intervals may overlap.  A value is inside an interval if the
+    number of lower edges below it exceeds the number of upper edges
+    below it, so a pair of sorts and searches replaces a comparison
+    against every interval.
+
+    Parameters
+    ----------
+    x : array
+        Values to classify
+    lows, highs : array
+        Lower and upper edges of the intervals
+    closed : bool
+        If True, the intervals include their edges
+
+    Returns
+    -------
+    bool array
+        True for the values of x that are in at least one interval
+    """
+    lows = np.asarray(lows)
+    highs = np.asarray(highs)
+    if closed:
+        n_started = np.searchsorted(np.sort(lows), x, side="right")
+        n_ended = np.searchsorted(np.sort(highs), x, side="left")
+    else:
+        # Empty open intervals would otherwise count as ended but not started
+        nonempty = lows < highs
+        n_started = np.searchsorted(np.sort(lows[nonempty]), x, side="left")
+        n_ended = np.searchsorted(np.sort(highs[nonempty]), x, side="right")
+    return n_started > n_ended
+
+
 class dmxrange:
     """Internal class for building DMX ranges"""
 
     def __init__(self, lofreqs, hifreqs):
-        """lofreqs and hifreqs are lists of MJDs that are in the low or high band respectively"""
+        """lofreqs and hifreqs are lists or arrays of MJDs that are in the low or high band respectively"""
         self.los = lofreqs
         self.his = hifreqs
-        self.min = min(lofreqs + hifreqs) - 0.001 * u.d
-        self.max = max(lofreqs + hifreqs) + 0.001 * u.d
+        mjds = self.mjds()
+        self.min = (mjds.min() - 0.001) * u.d
+        self.max = (mjds.max() + 0.001) * u.d
+
+    def mjds(self):
+        """All the MJDs in the range, as a plain array of days"""
+        return np.concatenate(
+            [
+                u.Quantity(self.los, u.d, copy=False).value,
+                u.Quantity(self.his, u.d, copy=False).value,
+            ]
+        )
 
     def sum_print(self):
         print(
@@ -630,26 +794,37 @@ def dmx_ranges_old(
 
     DMXs = []
 
-    good_his = set([])
+    # Each high freq obs belongs to the low freq obs that is within
+    # max_diff days of it and strictly closer to it than the neighboring
+    # low freq obs are.  loMJDs is sorted, so the only candidates are the
+    # nearest low freq obs and the ones on either side of it.
+    lo = loMJDs.to_value(u.d)
+    hi = hiMJDs.to_value(u.d)
+    owner = np.full(len(hi), -1)
+    if len(lo):
+        nearest = np.digitize(hi, 0.5 * (lo[:-1] + lo[1:]))
+        for k in (nearest - 1, nearest, nearest + 1):
+            inside = (k >= 0) & (k < len(lo))
+            kk = np.clip(k, 0, len(lo) - 1)
+            diffs = np.fabs(hi - lo[kk])
+            ok = inside & (diffs < max_diff.to_value(u.d))
+            ok &= (kk == 0) | (diffs < np.fabs(hi - lo[kk - 1]))
+            ok &= (kk == len(lo) - 1) | (
+                diffs < np.fabs(hi - lo[np.minimum(kk + 1, len(lo) - 1)])
+            )
+            owner[ok] = kk[ok]
+    good_his = owner >= 0
+    # Group the owned high freq obs by owner, keeping them sorted by date
+    order = np.argsort(owner[good_his], kind="stable")
+    owned = hiMJDs[good_his][order]
+    owners = owner[good_his][order]
+    starts = np.searchsorted(owners, np.arange(len(lo)), side="left")
+    ends = np.searchsorted(owners, np.arange(len(lo)), side="right")
+
     bad_los = []
-    # Walk through all of the low freq obs
-    for ii, loMJD in enumerate(loMJDs):
-        # find all the high freq obs within max_diff days
-        # of the low freq obs
-        hi_close = hiMJDs[np.fabs(hiMJDs - loMJD) < max_diff]
-        # and where they are closer to this loMJD compared to the
-        # other nearby ones
-        if ii > 0:
-            diffs = np.fabs(hi_close - loMJD)
-            lodiffs = np.fabs(hi_close - loMJDs[ii - 1])
-            hi_close = hi_close[diffs < lodiffs]
-        if ii < len(loMJDs) - 1:
-            diffs = np.fabs(hi_close - loMJD)
-            hidiffs = np.fabs(hi_close - loMJDs[ii + 1])
-            hi_close = hi_close[diffs < hidiffs]
-        if len(hi_close):  # add a DMXrange
-            DMXs.append(dmxrange([loMJD], list(hi_close)))
-            good_his = good_his.union(set(hi_close))
+    for loMJD, start, end in zip(loMJDs, starts, ends):
+        if end > start:  # add a DMXrange
+            DMXs.append(dmxrange([loMJD], owned[start:end]))
         else:
             bad_los.append(loMJD)
 
@@ -657,24 +832,24 @@ def dmx_ranges_old(
     saved_los = []
     # print bad_los
     # Now walk through the DMXs and see if we can't fit a bad_lo freq in
+    mins = np.array([DMX.min.to_value(u.d) for DMX in DMXs])
+    maxs = np.array([DMX.max.to_value(u.d) for DMX in DMXs])
+    max_diff_d = max_diff.to_value(u.d)
     for bad_lo in bad_los:
-        absmindiff = 2 * max_diff
-        ind = 0
-        for ii, DMX in enumerate(DMXs):
-            if (
-                np.fabs(bad_lo - DMX.min) < max_diff
-                and np.fabs(bad_lo - DMX.max) < max_diff
-            ):
-                mindiff = min(np.fabs(bad_lo - DMX.min), np.fabs(bad_lo - DMX.max))
-                if mindiff < absmindiff:
-                    absmindiff = mindiff
-                    ind = ii
-        if absmindiff < max_diff:
+        lo = bad_lo.to_value(u.d)
+        mindiffs = np.abs(lo - mins)
+        maxdiffs = np.abs(lo - maxs)
+        close = (mindiffs < max_diff_d) & (maxdiffs < max_diff_d)
+        if np.any(close):
+            # The first of the closest DMXs wins
+            ind = np.argmin(np.where(close, np.minimum(mindiffs, maxdiffs), np.inf))
             # print DMXs[ind].min, DMXs[ind].max, bad_lo
             DMXs[ind].los.append(bad_lo)
             # update the min and max vals
-            DMXs[ind].min = min(DMXs[ind].los + DMXs[ind].his)
-            DMXs[ind].max = max(DMXs[ind].los + DMXs[ind].his)
+            mjds = DMXs[ind].mjds()
+            mins[ind], maxs[ind] = mjds.min(), mjds.max()
+            DMXs[ind].min = mins[ind] * u.d
+            DMXs[ind].max = maxs[ind] * u.d
             saved_los.append(bad_lo)
 
     # These are the low-freq obs we can't save
@@ -682,8 +857,7 @@ def dmx_ranges_old(
     bad_los = sorted(list(bad_los))
 
     # These are the high-freq obs we can't save
-    bad_his = set(hiMJDs) - good_his
-    bad_his = sorted(list(bad_his))
+    bad_his = np.unique(hiMJDs[~good_his])
 
     if verbose:
         print("\n These are the 'good' ranges for DMX and days are low/high freq:")
@@ -708,11 +882,12 @@ def dmx_ranges_old(
             if DMX.min < oldmax:
                 print("Ack!  This shouldn't be happening!")
             oldmax = DMX.max
-    # Init mask to all False
-    mask = np.zeros_like(MJDs.value, dtype=bool)
     # Mark TOAs as True if they are in any DMX bin
-    for DMX in DMXs:
-        mask[np.logical_and(MJDs > DMX.min - offset, MJDs < DMX.max + offset)] = True
+    mask = _in_any_interval(
+        MJDs.to_value(u.d),
+        [(DMX.min - offset).to_value(u.d) for DMX in DMXs],
+        [(DMX.max + offset).to_value(u.d) for DMX in DMXs],
+    )
     log.info("{} out of {} TOAs are in a DMX bin".format(mask.sum(), len(mask)))
     # Instantiate a DMX component
     dmx_class = Component.component_types["DispersionDMX"]
@@ -784,33 +959,33 @@ def dmx_ranges(toas, divide_freq=1000.0 * u.MHz, binwidth=15.0 * u.d, verbose=Fa
     import pint.models.parameter
     from pint.models.timing_model import Component
 
-    MJDs = toas.get_mjds()
-    freqs = toas.table["freq"].quantity
+    # Do all the comparisons on bare values (MJDs in days, freqs in MHz)
+    MJDs = toas.get_mjds().to_value(u.d)
+    freqs = toas.table["freq"].quantity.to_value(u.MHz)
+    divide = divide_freq.to_value(u.MHz)
+    width = binwidth.to_value(u.d)
 
     DMXs = []
 
-    prevbinR2 = MJDs[0] - 0.001 * u.d
-    while True:
-        # Consider all TOAs with times after the last bin up through a total span of binwidth
-        # Get indexes that should be in this bin
-        # If there are no more MJDs to process, we are done.
-        if not np.any(MJDs > prevbinR2):
-            break
-        startMJD = MJDs[MJDs > prevbinR2][0]
-        binidx = np.logical_and(MJDs > prevbinR2, MJDs <= startMJD + binwidth)
-        if not np.any(binidx):
-            break
-        binMJDs = MJDs[binidx]
-        binfreqs = freqs[binidx]
-        loMJDs = binMJDs[binfreqs < divide_freq]
-        hiMJDs = binMJDs[binfreqs >= divide_freq]
+    # Walk through the TOAs in time order; each bin starts at the first TOA
+    # after the previous bin and spans a total of binwidth
+    order = np.argsort(MJDs)
+    sortedMJDs = MJDs[order]
+    sortedfreqs = freqs[order]
+    binstart = 0
+    while binstart < len(sortedMJDs):
+        binend = np.searchsorted(sortedMJDs, sortedMJDs[binstart] + width, side="right")
+        binMJDs = sortedMJDs[binstart:binend]
+        binfreqs = sortedfreqs[binstart:binend]
+        loMJDs = binMJDs[binfreqs < divide]
+        hiMJDs = binMJDs[binfreqs >= divide]
         # If we have freqs below and above the divide, this is a good bin
-        if np.any(binfreqs < divide_freq) and np.any(binfreqs > divide_freq):
-            DMXs.append(dmxrange(list(loMJDs), list(hiMJDs)))
+        if np.any(binfreqs < divide) and np.any(binfreqs > divide):
+            DMXs.append(dmxrange(loMJDs * u.d, hiMJDs * u.d))
         else:
             # These TOAs cannot be used
             pass
-        prevbinR2 = binMJDs.max()
+        binstart = binend
 
     if verbose:
         print(
@@ -819,11 +994,13 @@ def dmx_ranges(toas, divide_freq=1000.0 * u.MHz, binwidth=15.0 * u.d, verbose=Fa
         for DMX in DMXs:
             DMX.sum_print()
 
-    # Init mask to all False
-    mask = np.zeros_like(MJDs.value, dtype=bool)
     # Mark TOAs as True if they are in any DMX bin
-    for DMX in DMXs:
-        mask[np.logical_and(MJDs >= DMX.min, MJDs <= DMX.max)] = True
+    mask = _in_any_interval(
+        MJDs,
+        [DMX.min.to_value(u.d) for DMX in DMXs],
+        [DMX.max.to_value(u.d) for DMX in DMXs],
+        closed=True,
+    )
     log.info("{} out of {} TOAs are in a DMX bin".format(mask.sum(), len(mask)))
     # Instantiate a DMX component
     dmx_class = Component.component_types["DispersionDMX"]
@@ -881,32 +1058,39 @@ def dmxstats(fitter):
     """
 
     model = fitter.model
+    dmx_comp = model.components.get("DispersionDMX")
+    if dmx_comp is None:
+        return
     mjds = fitter.toas.get_mjds()
     freqs = fitter.toas.table["freq"]
-    ii = 1
-    while hasattr(model, "DMX_{:04d}".format(ii)):
-        mmask = np.logical_and(
-            mjds.value > getattr(model, "DMXR1_{:04d}".format(ii)).value,
-            mjds.value < getattr(model, "DMXR2_{:04d}".format(ii)).value,
-        )
-        if np.any(mmask):
-            mjds_in_bin = mjds[mmask]
-            freqs_in_bin = freqs[mmask]
+    # Sort the TOAs once so each bin is a contiguous slice
+    order = np.argsort(mjds.value, kind="stable")
+    mjds = mjds[order]
+    freqs = freqs[order]
+    # Use the indices actually present, which need not be contiguous
+    idx_list = list(dmx_comp.get_prefix_mapping_component("DMX_").keys())
+    r1s = [getattr(model, "DMXR1_{:04d}".format(ii)).value for ii in idx_list]
+    r2s = [getattr(model, "DMXR2_{:04d}".format(ii)).value for ii in idx_list]
+    starts = np.searchsorted(mjds.value, r1s, side="right")
+    ends = np.searchsorted(mjds.value, r2s, side="left")
+    for ii, start, end in zip(idx_list, starts, ends):
+        if end > start:
+            mjds_in_bin = mjds[start:end]
+            freqs_in_bin = freqs[start:end]
             span = (mjds_in_bin.max() - mjds_in_bin.min()).to(u.d)
             # Warning: min() and max() seem to strip the units
             freqspan = freqs_in_bin.max() - freqs_in_bin.min()
             print(
                 "DMX_{:04d}: NTOAS={:5d}, MJDSpan={:14.4f}, FreqSpan={:8.3f}-{:8.3f}".format(
-                    ii, mmask.sum(), span, freqs_in_bin.min(), freqs_in_bin.max()
+                    ii, end - start, span, freqs_in_bin.min(), freqs_in_bin.max()
                 )
             )
         else:
             print(
                 "DMX_{:04d}: NTOAS={:5d}, MJDSpan={:14.4f}, FreqSpan={:8.3f}-{:8.3f}".format(
-                    ii, mmask.sum(), 0 * u.d, 0 * u.MHz, 0 * u.MHz
+                    ii, 0, 0 * u.d, 0 * u.MHz, 0 * u.MHz
                 )
             )
-        ii += 1
 
     return
 
@@ -952,45 +1136,46 @@ def dmxparse(fitter, save=False):
     """
     # We get the DMX values, errors, and mjds (same as in getting the DMX values for DMX v. time)
     # Get number of DMX epochs
-    dmx_epochs = []
-    for p in fitter.model.params:
-        if "DMX_" in p:
-            dmx_epochs.append(p.split("_")[-1])
+    model = fitter.model
+    # Find each parameter's component once; looking parameters up on the
+    # model searches through all of its components every time
+    param_components = {}
+    for cp in model.components.values():
+        for p in cp.params:
+            param_components[p] = cp
+    dmx_epochs = [p.rpartition("_")[2] for p in model.params if p.startswith("DMX_")]
     # Check to make sure that there are DMX values in the model
     if not dmx_epochs:
         raise RuntimeError("No DMX values in model!")
     # Get DMX values (will be in units of 10^-3 pc cm^-3)
-    DMX_keys = []
-    DMXs = []
-    DMX_Errs = []
-    DMX_R1 = []
-    DMX_R2 = []
-    DMX_center_MJD = []
-    mask_idxs = []
-    for ii in dmx_epochs:
-        DMX_keys.append("DMX_{:}".format(ii))
-        DMXs.append(getattr(fitter.model, "DMX_{:}".format(ii)).value)
-        mask_idxs.append(getattr(fitter.model, "DMX_{:}".format(ii)).frozen)
-        DMX_Errs.append(getattr(fitter.model, "DMX_{:}".format(ii)).uncertainty_value)
-        dmxr1 = getattr(fitter.model, "DMXR1_{:}".format(ii)).value
-        dmxr2 = getattr(fitter.model, "DMXR2_{:}".format(ii)).value
-        DMX_R1.append(dmxr1)
-        DMX_R2.append(dmxr2)
-        DMX_center_MJD.append((dmxr1 + dmxr2) / 2)
-    DMXs = np.array(DMXs)
-    DMX_Errs = np.array(DMX_Errs)
-    DMX_R1 = np.array(DMX_R1)
-    DMX_R2 = np.array(DMX_R2)
-    DMX_center_MJD = np.array(DMX_center_MJD)
+    n = len(dmx_epochs)
+    DMX_keys = [f"DMX_{ii}" for ii in dmx_epochs]
+    DMXR1_keys = [f"DMXR1_{ii}" for ii in dmx_epochs]
+    DMXR2_keys = [f"DMXR2_{ii}" for ii in dmx_epochs]
+    DMXs = np.empty(n)
+    DMX_Errs = np.empty(n)
+    # The ranges are MJDs, so keep their full precision
+    DMX_R1 = np.empty(n, dtype=np.longdouble)
+    DMX_R2 = np.empty(n, dtype=np.longdouble)
+    mask_idxs = np.empty(n, dtype=bool)
+    for i, (k, k1, k2) in enumerate(zip(DMX_keys, DMXR1_keys, DMXR2_keys)):
+        dmx = getattr(param_components[k], k)
+        dmxr1 = getattr(param_components[k1], k1)
+        dmxr2 = getattr(param_components[k2], k2)
+        DMXs[i] = dmx.value
+        mask_idxs[i] = dmx.frozen
+        err = dmx.uncertainty_value
+        DMX_Errs[i] = np.nan if err is None else err
+        DMX_R1[i] = dmxr1.value
+        DMX_R2[i] = dmxr2.value
+    DMX_center_MJD = (DMX_R1 + DMX_R2) / 2
     # If any value need to be masked, do it
-    if True in mask_idxs:
+    masked = np.flatnonzero(mask_idxs)
+    if len(masked):
         log.warning(
             "Some DMX bins were not fit for, masking these bins for computation."
         )
         DMX_Errs = np.ma.array(DMX_Errs, mask=mask_idxs)
-        DMX_keys_ma = np.ma.array(DMX_keys, mask=mask_idxs)
-    else:
-        DMX_keys_ma = None
 
     # Make sure that the fitter has a covariance matrix, otherwise return the initial values
     if hasattr(fitter, "parameter_covariance_matrix"):
@@ -998,23 +1183,23 @@ def dmxparse(fitter, save=False):
         # access by label name to make sure we get the right values
         # make sure they are sorted in ascending order
         cc = fitter.parameter_covariance_matrix.get_label_matrix(
-            sorted(["DMX_" + x for x in dmx_epochs])
+            sorted(k for k, frozen in zip(DMX_keys, mask_idxs) if not frozen)
         )
-        n = len(DMX_Errs) - np.sum(mask_idxs)
+        n = len(DMX_Errs) - len(masked)
+        # One pass over the matrix gives both the total and the row sums
+        c = cc.matrix
+        row_sum = c.sum(axis=0)
+        total = row_sum.sum()
         # Find error in mean DM
         DMX_mean = np.mean(DMXs)
-        DMX_mean_err = np.sqrt(cc.matrix.sum()) / float(n)
-        # Do the correction for varying DM
-        m = np.identity(n) - np.ones((n, n)) / float(n)
-        cc = np.dot(np.dot(m, cc.matrix), m)
-        DMX_vErrs = np.zeros(n)
-        # We also need to correct for the units here
-        for i in range(n):
-            DMX_vErrs[i] = np.sqrt(cc[i, i])
-        # If array was masked, we need to add values back in where they were masked
-        if DMX_keys_ma is not None:
-            # Only need to add value to DMX_vErrs
-            DMX_vErrs = np.insert(DMX_vErrs, np.where(mask_idxs)[0], None)
+        DMX_mean_err = np.sqrt(total) / float(n)
+        # Do the correction for varying DM; only the diagonal of m C m with
+        # m = I - 1/n is needed, and since C is symmetric that is
+        # C_ii - 2 mean_j(C_ij) + mean(C)
+        cc_diag = np.einsum("ii->i", c) - 2 * row_sum / n + total / (n * n)
+        # We also need to correct for the units here; masked bins get NaN
+        DMX_vErrs = np.full(len(DMXs), np.nan)
+        DMX_vErrs[~mask_idxs] = np.sqrt(cc_diag)
     else:
         log.warning(
             "Fitter does not have covariance matrix, returning values from model"
@@ -1029,35 +1214,27 @@ def dmxparse(fitter, save=False):
 
     # Output the results'
     if save:
-        DMX = "DMX"
-        lines = []
-        lines.append("# Mean %s value = %+.6e \n" % (DMX, DMX_mean))
-        lines.append("# Uncertainty in average %s = %.5e \n" % ("DM", DMX_mean_err))
-        lines.append(
-            "# Columns: %sEP %s_value %s_var_err %sR1 %sR2 %s_bin \n"
-            % (DMX, DMX, DMX, DMX, DMX, DMX)
+        # Masked bins are written as nan
+        verrs = np.ma.filled(DMX_vErrs, np.nan)
+        header = (
+            f"# Mean DMX value = {DMX_mean:+.6e} \n"
+            f"# Uncertainty in average DM = {DMX_mean_err:.5e} \n"
+            "# Columns: DMXEP DMX_value DMX_var_err DMXR1 DMXR2 DMX_bin \n"
         )
-        for k in range(len(dmx_epochs)):
-            lines.append(
-                "%.4f %+.7e %.3e %.4f %.4f %s \n"
-                % (
-                    DMX_center_MJD[k],
-                    DMXs[k] - DMX_mean,
-                    DMX_vErrs[k],
-                    DMX_R1[k],
-                    DMX_R2[k],
-                    DMX_keys[k],
-                )
+        rows = "".join(
+            f"{ep:.4f} {v - DMX_mean:+.7e} {e:.3e} {r1:.4f} {r2:.4f} {k} \n"
+            for ep, v, e, r1, r2, k in zip(
+                DMX_center_MJD, DMXs, verrs, DMX_R1, DMX_R2, DMX_keys
             )
+        )
         with open("dmxparse.out", "w") as dmxout:
-            dmxout.writelines(lines)
-            dmxout.close()
+            dmxout.write(header + rows)
     # return the new mean subtracted values
     mean_sub_DMXs = DMXs - DMX_mean
 
     # Get units to multiply returned arrays by
-    DMX_units = getattr(fitter.model, "DMX_{:}".format(dmx_epochs[0])).units
-    DMXR_units = getattr(fitter.model, "DMXR1_{:}".format(dmx_epochs[0])).units
+    DMX_units = dmx.units
+    DMXR_units = dmxr1.units
 
     # define the output dictionary
     dmx = {}
@@ -1084,10 +1261,12 @@ def weighted_mean(arrin, weights_in, inputmean=None, calcerr=False, sdev=False):
     Parameters
     ----------
     arrin : array
-    Array containing the numbers whose weighted mean is desired.
+    Array containing the numbers whose weighted mean is desired. If it
+    has more than one dimension, each row along the last axis is treated
+    as a separate sample and the results are arrays over the other axes.
     weights: array
     A set of weights for each element in array. For measurements with
-    uncertainties, these should be 1/sigma^2.
+    uncertainties, these should be 1/sigma^2. Must broadcast against arrin.
     inputmean: float, optional
         An input mean value, around which the mean is calculated.
     calcerr : bool, optional
@@ -1112,21 +1291,34 @@ def weighted_mean(arrin, weights_in, inputmean=None, calcerr=False, sdev=False):
     """
     arr = arrin
     weights = weights_in
-    wtot = weights.sum()
+    stacked = np.ndim(arr) > 1 or np.ndim(weights) > 1
+    if stacked:
+        # Several samples at once (e.g. bootstrap resamples): reduce each
+        # along the last axis in a single pass
+        def wsum(w, a):
+            return (w * a).sum(axis=-1)
+
+    else:
+        wsum = np.dot
+    wtot = weights.sum(axis=-1)
     # user has input a mean value
     if inputmean is None:
-        wmean = (weights * arr).sum() / wtot
+        wmean = wsum(weights, arr) / wtot
     else:
         wmean = float(inputmean)
+    if calcerr or sdev:
+        # Squared residuals, shared by the error and the scatter
+        resid2 = arr - (np.expand_dims(wmean, -1) if stacked else wmean)
+        resid2 = resid2 * resid2
     # how should error be calculated?
     if calcerr:
-        werr2 = (weights ** 2 * (arr - wmean) ** 2).sum()
+        werr2 = wsum(weights * weights, resid2)
         werr = np.sqrt(werr2) / wtot
     else:
         werr = 1.0 / np.sqrt(wtot)
     # should output include the weighted standard deviation?
     if sdev:
-        wvar = (weights * (arr - wmean) ** 2).sum() / wtot
+        wvar = wsum(weights, resid2) / wtot
         wsdev = np.sqrt(wvar)
         return wmean, werr, wsdev
     else:
@@ -1163,13 +1355,15 @@ def ELL1_check(
         If outstring is True then returns a string summary instead.
 
     """
-    lhs = A1 / const.c * E ** 2.0
-    rhs = TRES / np.sqrt(NTOA)
+    # Convert both sides to microseconds once, so the comparisons below
+    # are on plain numbers
+    lhs = (A1 / const.c * E ** 2.0).to_value(u.us)
+    rhs = TRES.to_value(u.us) / np.sqrt(NTOA)
     if outstring:
         s = "Checking applicability of ELL1 model -- \n"
         s += "    Condition is asini/c * ecc**2 << timing precision / sqrt(# TOAs) to use ELL1\n"
-        s += "    asini/c * ecc**2    = {:.3g} \n".format(lhs.to(u.us))
-        s += "    TRES / sqrt(# TOAs) = {:.3g} \n".format(rhs.to(u.us))
+        s += "    asini/c * ecc**2    = {:.3g} us \n".format(lhs)
+        s += "    TRES / sqrt(# TOAs) = {:.3g} us \n".format(rhs)
     if lhs * 50.0 < rhs:
         if outstring:
             s += "    Should be fine.\n"
@@ -1219,6 +1413,8 @@ def FTest(chi2_1, dof_1, chi2_2, dof_2):
         F-test significance value for the model with the larger number of
         components over the other.
     """
+    from scipy.special import fdtrc
+
     delta_chi2 = chi2_1 - chi2_2
     if delta_chi2 > 0 and dof_1 != dof_2:
         delta_dof = dof_1 - dof_2
@@ -1240,85 +1436,143 @@ def FTest(chi2_1, dof_1, chi2_2, dof_2):
     return ft
 
 
-def add_dummy_distance(c, distance=1 * u.kpc):
-    """Adds a dummy distance to a SkyCoord object for applying proper motion
+def FTest_batch(chi2_1, dof_1, chi2_2, dof_2):
+    """Run many F-tests at once.
+
+    Array version of :func:`FTest`, for screening many candidate models in
+    one call; all arguments are broadcast against each other and
+    ``fdtrc`` is evaluated once on the whole array.  The edge cases are
+    handled as in :func:`FTest`: equal degrees of freedom give NaN and a
+    chi^2 that did not improve gives 1.  Invalid inputs such as NaN
+    produce NaN instead of raising.
 
     Parameters
-    ----------
-    c: astropy.coordinates.SkyCoord
-        current SkyCoord object without distance but with proper motion and obstime
-    distance: astropy.units.Quantity, optional
-        distance to supply
+    -----------
+    chi2_1 : array-like
+        Chi-squared values of the models with fewer parameters
+    dof_1 : array-like
+        Degrees of freedom of the models with fewer parameters
+    chi2_2 : array-like
+        Chi-squared values of the models with more parameters
+    dof_2 : array-like
+        Degrees of freedom of the models with more parameters
 
     Returns
-    -------
-    cnew : astropy.coordinates.SkyCoord
-        new SkyCoord object with a distance attached
+    --------
+    ft : numpy.ndarray
+        F-test significance values for each pair of models.
     """
+    from scipy.special import fdtrc
 
-    if c.frame.data.differentials == {}:
+    # fdtrc doesn't like float128
+    chi2_1, dof_1, chi2_2, dof_2 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (chi2_1, dof_1, chi2_2, dof_2))
+    )
+    delta_chi2 = chi2_1 - chi2_2
+    delta_dof = dof_1 - dof_2
+    equal_dof = delta_dof == 0
+    worse = (delta_chi2 <= 0) & ~equal_dof
+    if equal_dof.any():
         log.warning(
-            "No proper motions available for %r: returning coordinates unchanged" % c
+            "Models have equal degrees of freedom for %d of the pairs, "
+            "cannot perform F-test." % equal_dof.sum()
         )
-        return c
-    if c.obstime is None:
-        log.warning("No obstime available for %r: returning coordinates unchanged" % c)
-        return c
+    if worse.any():
+        log.warning(
+            "Chi^2 for Model 2 is larger than Chi^2 for Model 1 for %d of the pairs, "
+            "cannot perform F-test." % worse.sum()
+        )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        F = (delta_chi2 / delta_dof) / (chi2_2 / dof_2)
+        ft = fdtrc(delta_dof, dof_2, F)
+    ft = np.where(worse, 1.0, ft)
+    return np.where(equal_dof, np.nan, ft)
 
-    if isinstance(c.frame, coords.builtin_frames.icrs.ICRS):
-        if hasattr(c, "pm_ra_cosdec"):
-            cnew = coords.SkyCoord(
-                ra=c.ra,
-                dec=c.dec,
-                pm_ra_cosdec=c.pm_ra_cosdec,
-                pm_dec=c.pm_dec,
-                obstime=c.obstime,
-                distance=distance,
-                frame=coords.ICRS,
-            )
-        else:
-            # it seems that after applying proper motions
-            # it changes the RA pm to pm_ra instead of pm_ra_cosdec
-            # although the value seems the same
-            cnew = coords.SkyCoord(
-                ra=c.ra,
-                dec=c.dec,
-                pm_ra_cosdec=c.pm_ra,
-                pm_dec=c.pm_dec,
-                obstime=c.obstime,
-                distance=distance,
-                frame=coords.ICRS,
-            )
 
-        return cnew
-    elif isinstance(c.frame, coords.builtin_frames.galactic.Galactic):
-        cnew = coords.SkyCoord(
-            l=c.l,
-            b=c.b,
-            pm_l_cosb=c.pm_l_cosb,
-            pm_b=c.pm_b,
-            obstime=c.obstime,
-            distance=distance,
-            frame=coords.Galactic,
+@lru_cache()
+def _dummy_distance_frames():
+    """Map each supported frame class to a function giving its SkyCoord arguments.
+
+    Built on first use rather than at import since ``pint.pulsar_ecliptic``
+    imports this module.
+    """
+    import astropy.coordinates as coords
+    import pint.pulsar_ecliptic
+
+    def icrs(c):
+        # it seems that after applying proper motions
+        # it changes the RA pm to pm_ra instead of pm_ra_cosdec
+        # although the value seems the same
+        pm_ra_cosdec = c.pm_ra_cosdec if hasattr(c, "pm_ra_cosdec") else c.pm_ra
+        return dict(
+            ra=c.ra,
+            dec=c.dec,
+            pm_ra_cosdec=pm_ra_cosdec,
+            pm_dec=c.pm_dec,
+            frame=coords.ICRS,
+        )
+
+    def galactic(c):
+        return dict(
+            l=c.l, b=c.b, pm_l_cosb=c.pm_l_cosb, pm_b=c.pm_b, frame=coords.Galactic
         )
-        return cnew
-    elif isinstance(c.frame, pint.pulsar_ecliptic.PulsarEcliptic):
-        cnew = coords.SkyCoord(
+
+    def ecliptic(c):
+        return dict(
             lon=c.lon,
             lat=c.lat,
             pm_lon_coslat=c.pm_lon_coslat,
             pm_lat=c.pm_lat,
-            obstime=c.obstime,
-            distance=distance,
             obliquity=c.obliquity,
             frame=pint.pulsar_ecliptic.PulsarEcliptic,
         )
-        return cnew
-    else:
+
+    return {
+        coords.ICRS: icrs,
+        coords.Galactic: galactic,
+        pint.pulsar_ecliptic.PulsarEcliptic: ecliptic,
+    }
+
+
+def _rebuild_skycoord(c, **kwargs):
+    """Rebuild a SkyCoord with its proper motion and obstime, adding any extra arguments."""
+    import astropy.coordinates as coords
+
+    if c.frame.data.differentials == {}:
+        log.warning(
+            "No proper motions available for %r: returning coordinates unchanged" % c
+        )
+        return c
+    if c.obstime is None:
+        log.warning("No obstime available for %r: returning coordinates unchanged" % c)
+        return c
+
+    frame_args = _dummy_distance_frames().get(type(c.frame))
+    if frame_args is None:
         log.warning(
             "Do not know coordinate frame for %r: returning coordinates unchanged" % c
         )
         return c
+    # Share the component arrays with c rather than copying them
+    return coords.SkyCoord(obstime=c.obstime, copy=False, **kwargs, **frame_args(c))
+
+
+def add_dummy_distance(c, distance=1 * u.kpc):
+    """Adds a dummy distance to a SkyCoord object for applying proper motion
+
+    Parameters
+    ----------
+    c: astropy.coordinates.SkyCoord
+        current SkyCoord object without distance but with proper motion and obstime
+    distance: astropy.units.Quantity, optional
+        distance to supply
+
+    Returns
+    -------
+    cnew : astropy.coordinates.SkyCoord
+        new SkyCoord object with a distance attached
+    """
+    return _rebuild_skycoord(c, distance=distance)
 
 
 def remove_dummy_distance(c):
@@ -1334,66 +1588,7 @@ def remove_dummy_distance(c):
     cnew : astropy.coordinates.SkyCoord
         new SkyCoord object with a distance removed
     """
-
-    if c.frame.data.differentials == {}:
-        log.warning(
-            "No proper motions available for %r: returning coordinates unchanged" % c
-        )
-        return c
-    if c.obstime is None:
-        log.warning("No obstime available for %r: returning coordinates unchanged" % c)
-        return c
-
-    if isinstance(c.frame, coords.builtin_frames.icrs.ICRS):
-        if hasattr(c, "pm_ra_cosdec"):
-
-            cnew = coords.SkyCoord(
-                ra=c.ra,
-                dec=c.dec,
-                pm_ra_cosdec=c.pm_ra_cosdec,
-                pm_dec=c.pm_dec,
-                obstime=c.obstime,
-                frame=coords.ICRS,
-            )
-        else:
-            # it seems that after applying proper motions
-            # it changes the RA pm to pm_ra instead of pm_ra_cosdec
-            # although the value seems the same
-            cnew = coords.SkyCoord(
-                ra=c.ra,
-                dec=c.dec,
-                pm_ra_cosdec=c.pm_ra,
-                pm_dec=c.pm_dec,
-                obstime=c.obstime,
-                frame=coords.ICRS,
-            )
-        return cnew
-    elif isinstance(c.frame, coords.builtin_frames.galactic.Galactic):
-        cnew = coords.SkyCoord(
-            l=c.l,
-            b=c.b,
-            pm_l_cosb=c.pm_l_cosb,
-            pm_b=c.pm_b,
-            obstime=c.obstime,
-            frame=coords.Galactic,
-        )
-        return cnew
-    elif isinstance(c.frame, pint.pulsar_ecliptic.PulsarEcliptic):
-        cnew = coords.SkyCoord(
-            lon=c.lon,
-            lat=c.lat,
-            pm_lon_coslat=c.pm_lon_coslat,
-            pm_lat=c.pm_lat,
-            obstime=c.obstime,
-            obliquity=c.obliquity,
-            frame=pint.pulsar_ecliptic.PulsarEcliptic,
-        )
-        return cnew
-    else:
-        log.warning(
-            "Do not know coordinate frame for %r: returning coordinates unchanged" % c
-        )
-        return c
+    return _rebuild_skycoord(c)
 
 
 def info_string(prefix_string="# ", comment=None):
@@ -1530,6 +1725,54 @@ def info_string(prefix_string="# ", comment=None):
     return s
 
 
+@lru_cache(maxsize=None)
+def _component_parameters(class_):
+    """Describe the parameters of one Component type, for :func:`list_parameters`.
+
+    Instantiating a component is the expensive part, so the result is cached;
+    use :func:`list_parameters` to get a copy that is safe to modify.
+    """
+    from pint.models.parameter import (
+        boolParameter,
+        intParameter,
+        maskParameter,
+        prefixParameter,
+        strParameter,
+    )
+
+    result = []
+    inst = class_()
+    for p in inst.params:
+        pm = getattr(inst, p)
+        d = dict(
+            name=pm.name,
+            class_=f"{class_.__module__}.{class_.__name__}",
+            description=pm.description,
+        )
+        if pm.aliases:
+            d["aliases"] = [a for a in pm.aliases if a != pm.name]
+        if pm.units:
+            d["kind"] = pm.units.to_string()
+            if not d["kind"]:
+                d["kind"] = "number"
+        elif isinstance(pm, boolParameter):
+            d["kind"] = "boolean"
+        elif isinstance(pm, strParameter):
+            d["kind"] = "string"
+        elif isinstance(pm, intParameter):
+            d["kind"] = "integer"
+        if isinstance(pm, prefixParameter):
+            d["name"] = pm.prefix + "{number}"
+            d["aliases"] = [a + "{number}" for a in pm.prefix_aliases]
+        if isinstance(pm, maskParameter):
+            d["name"] = pm.origin_name + " {flag} {value}"
+            d["aliases"] = [a + " {flag} {value}" for a in pm.prefix_aliases]
+        if "aliases" in d and not d["aliases"]:
+            del d["aliases"]
+        result.append(d)
+    return result
+
+
 def list_parameters(class_=None):
     """List parameters understood by PINT.
 
@@ -1546,62 +1789,34 @@ def list_parameters(class_=None):
         or lists of strings, and will include at least "name", "classes", and "description".
     """
     if class_ is not None:
-        from pint.models.parameter import (
-            boolParameter,
-            intParameter,
-            maskParameter,
-            prefixParameter,
-            strParameter,
-        )
-
-        result = []
-        inst = class_()
-        for p in inst.params:
-            pm = getattr(inst, p)
-            d = dict(
-                name=pm.name,
-                class_=f"{class_.__module__}.{class_.__name__}",
-                description=pm.description,
-            )
-            if pm.aliases:
-                d["aliases"] = [a for a in pm.aliases if a != pm.name]
-            if pm.units:
-                d["kind"] = pm.units.to_string()
-                if not d["kind"]:
-                    d["kind"] = "number"
-            elif isinstance(pm, boolParameter):
-                d["kind"] = "boolean"
-            elif isinstance(pm, strParameter):
-                d["kind"] = "string"
-            elif isinstance(pm, intParameter):
-                d["kind"] = "integer"
-            if isinstance(pm, prefixParameter):
-                d["name"] = pm.prefix + "{number}"
-                d["aliases"] = [a + "{number}" for a in pm.prefix_aliases]
-            if isinstance(pm, maskParameter):
-                d["name"] = pm.origin_name + " {flag} {value}"
-                d["aliases"] = [a + " {flag} {value}" for a in pm.prefix_aliases]
-            if "aliases" in d and not d["aliases"]:
-                del d["aliases"]
-            result.append(d)
-        return result
+        # Copy the cached descriptions, including their lists, so callers can't alter them
+        return [
+            {k: list(v) if isinstance(v, list) else v for k, v in d.items()}
+            for d in _component_parameters(class_)
+        ]
     else:
         import pint.models.timing_model
 
         results = {}
+        # Hashable summary of each description, to check that every class
+        # describes a shared parameter the same way
+        fingerprints = {}
         ct = pint.models.timing_model.Component.component_types.copy()
         ct["TimingModel"] = pint.models.timing_model.TimingModel
         for v in ct.values():
             for d in list_parameters(v):
                 n = d["name"]
                 class_ = d.pop("class_")
+                fp = tuple(
+                    (k, tuple(x) if isinstance(x, list) else x)
+                    for k, x in sorted(d.items())
+                )
                 if n not in results:
+                    fingerprints[n] = fp
                     d["classes"] = [class_]
                     results[n] = d
                 else:
-                    r = results[n].copy()
-                    r.pop("classes")
-                    if r != d:
+                    if fp != fingerprints[n]:
                         raise ValueError(
                             f"Parameter {d} in class {class_} does not match {results[n]}"
                         )
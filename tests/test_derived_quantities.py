@@ -313,3 +313,26 @@ def test_a1sini_Mp_array(Mp, Mc, Pb, i):
     i = i * u.deg
     x = a1sini(Mp, Mc, Pb, i=i)
     assert np.allclose(Mp, pulsar_mass(Pb, x, Mc, i))
+
+
+def test_companion_mass_broadcasts():
+    Pb = np.array([1.0, 10.0]) * u.d
+    x = np.array([1.0, 20.0]) * pint.ls
+    i = np.array([[30.0], [60.0], [90.0]]) * u.deg
+    Mc = companion_mass(Pb, x, i=i, mp=1.4 * u.Msun)
+    assert Mc.shape == (3, 2)
+    for j in range(3):
+        for k in range(2):
+            assert np.isclose(Mc[j, k], companion_mass(Pb[k], x[k], i=i[j, 0]))
+    assert np.allclose(pulsar_mass(Pb, x, Mc, i), 1.4 * u.Msun)
+
+
+def test_companion_mass_checks_units():
+    with pytest.raises(u.UnitsError):
+        companion_mass(1 * u.d, 2 * pint.ls, mp=1.4 * u.s)
+    with pytest.raises(TypeError):
+        companion_mass(1 * u.d, 2 * pint.ls, i=np.array([0.5, 1.0]))
+    assert np.isclose(
+        companion_mass(1 * u.d, 2 * pint.ls, i=np.pi / 6 * u.rad),
+        companion_mass(1 * u.d, 2 * pint.ls, i=30 * u.deg),
+    )
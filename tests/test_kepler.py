@@ -20,6 +20,12 @@ def test_mass_derivs():
     check_all_partials(kepler.mass_partials, [a, pb])
 
 
+def test_mass_derivs_vectorized():
+    a = 2
+    pb = 3
+    check_all_partials(kepler.mass_partials, [a, pb], vectorized=True)
+
+
 def test_kepler_2d_t0():
     p = kepler.Kepler2DParameters(a=2, pb=3, eps1=0.2, eps2=0.1, t0=1)
     xyv, _ = kepler.kepler_2d(p, p.t0)
@@ -43,3 +43,29 @@ def test_random_models():
 
     # this should be less than the fully free version
     assert dphase_F.std(axis=0).max() < dphase.std(axis=0).max()
+
+
+def test_random_models_linear():
+    m, t = get_model_and_toas(
+        os.path.join(datadir, "NGC6440E.par"), os.path.join(datadir, "NGC6440E.tim")
+    )
+    f = fitter.WLSFitter(toas=t, model=m)
+    f.model.free_params = ("F0", "F1", "RAJ", "DECJ")
+    f.fit_toas()
+    tnew = simulation.make_fake_toas_uniform(54200, 59000, 100, f.model)
+
+    np.random.seed(0)
+    dphase, mrand = simulation.calculate_random_models(f, tnew, Nmodels=20)
+    np.random.seed(0)
+    dphase_lin, mrand_lin = simulation.calculate_random_models(
+        f, tnew, Nmodels=20, linear=True
+    )
+    # these parameters enter the phase (nearly) linearly
+    assert np.abs(dphase - dphase_lin).max() < 1e-4
+    assert [m.F0.value for m in mrand] == [m.F0.value for m in mrand_lin]
+
+    np.random.seed(0)
+    dt = simulation.calculate_random_models(
+        f, tnew, Nmodels=20, keep_models=False, return_time=True, linear=True
+    )
+    assert dt.unit == u.s
@@ -39,14 +39,23 @@ from pint.pulsar_mjd import (
 )
 from pint.utils import (
     FTest,
+    FTest_batch,
     PosVel,
+    dmx_ranges,
+    dmx_ranges_old,
     dmxparse,
+    dmxstats,
     interesting_lines,
     lines_of,
     open_or_use,
     taylor_horner,
     taylor_horner_deriv,
     list_parameters,
+    numeric_partials,
+    show_param_cov_matrix,
+    split_prefixed_name,
+    weighted_mean,
+    PrefixError,
 )
 
 
@@ -60,6 +69,29 @@ def test_taylor_horner_basic():
     ) == 10 + 3 * 2.0 + 4 * 2.0 ** 2 / 2.0 + 12 * 2.0 ** 3 / (3.0 * 2.0)
 
 
+def test_taylor_horner_bare_zero_coefficients():
+    x = [1.0, 2.0] * u.s
+    assert_array_equal(taylor_horner(x, [0.0, 1 * u.Hz / u.s]), [1.0, 2.0] * u.Hz)
+    assert_array_equal(
+        taylor_horner(x, [0, 2 * u.m / u.s, 1 * u.m / u.s ** 2]), [2.5, 6.0] * u.m
+    )
+    assert_array_equal(
+        taylor_horner_deriv(x, [0.0, 0.0, 1 * u.Hz / u.s], 1), [1.0, 2.0] * u.Hz
+    )
+    with pytest.raises(u.UnitConversionError):
+        taylor_horner(x, [1.0, 1 * u.Hz / u.s])
+
+
+def test_numeric_partials_vectorized_matches_loop():
+    def f(x, y, z):
+        return [x * y, np.sin(z) * x, y ** 2 + z]
+
+    args = [1.5, -0.3, 2.0]
+    assert_allclose(
+        numeric_partials(f, args, vectorized=True), numeric_partials(f, args)
+    )
+
+
 contents = """Random text file
 
 with some stuff
@@ -263,6 +295,29 @@ def test_posvel_broadcast_retains_quantity(pos_vel_shape, l_unit, t_unit):
     assert pv.vel.unit == l_unit / t_unit
 
 
+def test_posvel_add_converts_units():
+    pv1 = PosVel([1, 0, 0] * u.km, [0, 1, 0] * u.km / u.s, obj="a", origin="b")
+    pv2 = PosVel([1, 0, 0] * u.m, [0, 1, 0] * u.m / u.s, obj="b", origin="c")
+    pv = pv1 + pv2
+    assert pv.pos.unit == u.km
+    assert pv.vel.unit == u.km / u.s
+    assert_allclose(pv.pos.value, [1.001, 0, 0])
+    assert_allclose(pv.vel.value, [0, 1.001, 0])
+    assert_allclose((pv1 - pv1).pos.value, 0)
+
+
+def test_posvel_add_incompatible_units_raises():
+    pv1 = PosVel([1, 0, 0] * u.km, [0, 1, 0] * u.km / u.s)
+    pv2 = PosVel([1, 0, 0] * u.s, [0, 1, 0] * u.km / u.s)
+    with pytest.raises(u.UnitsError):
+        pv1 + pv2
+
+
+def test_posvel_bogus_velocity_message():
+    with pytest.raises(ValueError, match="Velocity"):
+        PosVel([1, 0, 0], [1, 0, 0, 0])
+
+
 def test_posvel_reject_bogus_sizes():
     with pytest.raises(ValueError):
         PosVel([1, 0], [1, 0, 0])
@@ -274,6 +329,14 @@ def test_posvel_reject_bogus_sizes():
         PosVel([1, 0, 0, 0], np.array([1, 0]) * u.m)
 
 
+def test_posvel_pos_vel_read_only():
+    pv = PosVel(np.ones(3) * u.m, np.ones(3) * u.m / u.s)
+    with pytest.raises(AttributeError):
+        pv.pos = np.zeros(3) * u.m
+    with pytest.raises(AttributeError):
+        pv.vel = np.zeros(3) * u.m / u.s
+
+
 def test_posvel_str_sensible():
     assert "->" in str(PosVel([1, 0, 0], [0, 1, 0], "earth", "mars"))
     assert "earth" in str(PosVel([1, 0, 0], [0, 1, 0], "earth", "mars"))
@@ -617,6 +680,99 @@ def test_dmxparse():
     dmx = dmxparse(f, save=False)
 
 
+def test_dmxparse_frozen_bins():
+    m = tm.get_model(os.path.join(datadir, "B1855+09_NANOGrav_9yv1.gls.par"))
+    t = toa.get_TOAs(os.path.join(datadir, "B1855+09_NANOGrav_9yv1.tim"))
+    m.DMX_0002.frozen = True
+    m.DMX_0003.frozen = True
+    f = fitter.GLSFitter(toas=t, model=m)
+    f.fit_toas()
+    dmx = dmxparse(f, save=False)
+    assert_array_equal(np.flatnonzero(np.isnan(dmx["dmx_verrs"])), [1, 2])
+
+
+def test_dmxstats_skips_gaps_in_numbering(capsys):
+    m = tm.get_model(os.path.join(datadir, "B1855+09_NANOGrav_9yv1.gls.par"))
+    t = toa.get_TOAs(os.path.join(datadir, "B1855+09_NANOGrav_9yv1.tim"))
+    m.components["DispersionDMX"].remove_DMX_range(2)
+    dmxstats(fitter.WLSFitter(toas=t, model=m))
+    lines = capsys.readouterr().out.splitlines()
+    names = [line.split(":")[0] for line in lines]
+    expected = list(m.components["DispersionDMX"].get_prefix_mapping_component("DMX_"))
+    assert names == ["DMX_{:04d}".format(ii) for ii in expected]
+    assert "DMX_0002" not in names and "DMX_0003" in names
+
+
+def test_dmxstats_without_dmx(capsys):
+    m = tm.get_model(os.path.join(datadir, "NGC6440E.par"))
+    t = toa.get_TOAs(os.path.join(datadir, "NGC6440E.tim"))
+    dmxstats(fitter.WLSFitter(toas=t, model=m))
+    assert capsys.readouterr().out == ""
+
+
+def test_dmx_ranges_independent_of_toa_order():
+    t = toa.get_TOAs(os.path.join(datadir, "B1855+09_NANOGrav_9yv1.tim"))
+    order = np.argsort(t.get_mjds().value)
+    mask, comp = dmx_ranges(t)
+    mask_sorted, comp_sorted = dmx_ranges(t[order])
+    assert_array_equal(mask[order], mask_sorted)
+    assert comp.params == comp_sorted.params
+    for p in comp.params:
+        assert getattr(comp, p).value == getattr(comp_sorted, p).value
+
+
+def test_dmx_ranges_old_bins():
+    t = toa.get_TOAs(os.path.join(datadir, "B1855+09_NANOGrav_9yv1.tim"))
+    mask, comp = dmx_ranges_old(t)
+    assert mask.any()
+    r1 = np.array([getattr(comp, p).value for p in comp.params if "DMXR1_" in p])
+    r2 = np.array([getattr(comp, p).value for p in comp.params if "DMXR2_" in p])
+    assert np.all(np.diff(r1) > 0)
+    assert np.all(r2 - r1 < 15 + 2 * 0.01)
+
+
+def test_dmx_ranges_old_bad_his_sorted_unique(capsys):
+    t = toa.get_TOAs(os.path.join(datadir, "B1855+09_NANOGrav_9yv1.tim"))
+    dmx_ranges_old(toa.merge_TOAs([t, t]), max_diff=0.5 * u.d, verbose=True)
+    out = capsys.readouterr().out
+    block = out.split("Remove high-frequency data from these days:")[1]
+    block = block.split("Remove low-frequency data")[0]
+    days = [float(line) for line in block.split()]
+    assert days
+    assert days == sorted(set(days))
+
+
+def test_show_param_cov_matrix_switchRD():
+    params = ["F0", "RAJ", "DECJ"]
+    matrix = [[1.0, 0.1, 0.2], [0.1, 2.0, 0.3], [0.2, 0.3, 3.0]]
+    with pytest.warns(DeprecationWarning):
+        out = show_param_cov_matrix(matrix, params, switchRD=True)
+    lines = out.splitlines()
+    assert lines[3].startswith("DEC ::  ")
+    assert "3.00" in lines[3]
+    assert lines[4].startswith("RAJ ::  ")
+    assert lines[4].split()[-3] == "2.00"
+    # The input is left alone
+    assert matrix[1][1] == 2.0
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_in_any_interval_matches_loop(closed):
+    from pint.utils import _in_any_interval
+
+    rng = np.random.default_rng(0)
+    x = np.round(rng.uniform(0, 20, 500))
+    lows = np.round(rng.uniform(0, 20, 30))
+    highs = lows + np.round(rng.uniform(0, 3, 30))
+    expected = np.zeros(len(x), dtype=bool)
+    for lo, hi in zip(lows, highs):
+        if closed:
+            expected |= (x >= lo) & (x <= hi)
+        else:
+            expected |= (x > lo) & (x < hi)
+    assert_array_equal(_in_any_interval(x, lows, highs, closed=closed), expected)
+
+
 def test_pmtot():
     """Test pmtot calculation"""
     from pint.utils import pmtot
@@ -678,6 +834,16 @@ def test_Ftest_dof_same():
     assert np.isnan(FTest(100, 100, 100, 100))
 
 
+def test_Ftest_batch_matches_FTest():
+    chi2_1 = np.array([5116.3297879409574835, 100, 100, 120])
+    dof_1 = np.array([4961, 100, 100, 90])
+    chi2_2 = np.array([5110.749818644068647, 101, 100, 100])
+    dof_2 = np.array([4960, 99, 100, 89])
+    ft = FTest_batch(chi2_1, dof_1, chi2_2, dof_2)
+    expected = [FTest(*a) for a in zip(chi2_1, dof_1, chi2_2, dof_2)]
+    assert_allclose(ft, expected)
+
+
 @pytest.mark.parametrize(
     "x, coeffs, order",
     [
@@ -725,5 +891,58 @@ def test_taylor_horner_units_ok(x, result, n):
     taylor_horner(x, coeffs) + result
 
 
+def test_taylor_horner_deriv_units_match_bare_values():
+    x = np.linspace(-1e5, 1e5, 7) * u.s
+    coeffs = [0 * u.dimensionless_unscaled, 100 * u.Hz, -1e-12 * u.Hz / u.s]
+    bare = taylor_horner_deriv(x.value, [c.value for c in coeffs], 1)
+    r = taylor_horner_deriv(x, coeffs, 1)
+    assert r.unit == u.Hz
+    assert_allclose(r.value, bare)
+
+
 def test_list_parameters():
     list_parameters()
+
+
+def test_list_parameters_returns_copies():
+    params = list_parameters()
+    expected = [dict(d, classes=list(d["classes"])) for d in params]
+    params[0]["classes"].append("bogus")
+    params[1]["name"] = "bogus"
+    assert list_parameters() == expected
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("F12", ("F", "12", 12)),
+        ("DMX_0001", ("DMX_", "0001", 1)),
+        ("DMXR1_0002", ("DMXR1_", "0002", 2)),
+        ("T2EFAC3", ("T2EFAC", "3", 3)),
+        ("GLF0_4", ("GLF0_", "4", 4)),
+    ],
+)
+def test_split_prefixed_name(name, expected):
+    assert split_prefixed_name(name) == expected
+    # Cached results must be the same
+    assert split_prefixed_name(name) == expected
+
+
+@pytest.mark.parametrize("name", ["PEPOCH", "DMX_", "1"])
+def test_split_prefixed_name_bad(name):
+    with pytest.raises(PrefixError):
+        split_prefixed_name(name)
+
+
+@pytest.mark.parametrize("calcerr", [False, True])
+def test_weighted_mean_stacked(calcerr):
+    rng = np.random.default_rng(0)
+    arr = rng.normal(size=(4, 50)) * u.us
+    weights = rng.uniform(0.5, 2, size=(4, 50)) / u.us ** 2
+    wmean, werr, wsdev = weighted_mean(arr, weights, calcerr=calcerr, sdev=True)
+    assert wmean.shape == werr.shape == wsdev.shape == (4,)
+    for i in range(4):
+        m, e, s = weighted_mean(arr[i], weights[i], calcerr=calcerr, sdev=True)
+        assert_allclose(wmean[i].to_value(u.us), m.to_value(u.us))
+        assert_allclose(werr[i].to_value(u.us), e.to_value(u.us))
+        assert_allclose(wsdev[i].to_value(u.us), s.to_value(u.us))